@@ -1,8 +1,9 @@
 import asyncio
-import json
 import os
+from collections import defaultdict
 from datetime import datetime
 
+import orjson
 import pandas as pd
 from dotenv import load_dotenv
 
@@ -27,10 +28,16 @@ async def main():
         await send_error_to_telegram(error_msg)
         raise RuntimeError(error_msg)
 
-    # Load sources from CSV (no DB needed)
+    # Load sources from CSV (no DB needed), grouped by platform in one pass
     sources = get_all_sources()
-    list_channel_id_discord = [s["channel_id"] for s in sources if s["platform"] == "discord"]
-    list_channel_id_telegram = [s["channel_id"] for s in sources if s["platform"] == "telegram"]
+    grouped = defaultdict(list)
+    for s in sources:
+        grouped[s["platform"]].append(s["channel_id"])
+    list_channel_id_discord = grouped["discord"]
+    list_channel_id_telegram = grouped["telegram"]
+
+    # Classifier Init (fails fast on missing API key, before any scraping)
+    classification_class = LLMClassifier()
 
     # Telegram Init
     tg_scraper = TelegramScraper()
@@ -38,37 +45,65 @@ async def main():
 
     try:
 
+        # Classification overlaps scraping: each source's frame is handed to
+        # the classifier as soon as that source finishes, so the LLM works
+        # through the fast sources while the slow ones are still fetching.
+        classify_tasks: list[asyncio.Task] = []
+
+        def _classify_when_scraped(df_source: pd.DataFrame):
+            classify_tasks.append(asyncio.create_task(
+                classification_class.classify(df=df_source, batch_size=10, max_concurrent=5)
+            ))
+
         df_combined, run_stats = await scrape_all_sources(telethon_client=client,
                                                           telegram_groups=list_channel_id_telegram,
                                                           discord_channels=list_channel_id_discord,
-                                                          max_concurrent=10)
-        # Classification
-        classification_class = LLMClassifier()
-        df = await classification_class.classify(df=df_combined, batch_size=10, max_concurrent=5)
-
-        df_merged = pd.merge(df_combined, df, on=["id", "platform"], how="left")
+                                                          max_concurrent=10,
+                                                          on_source_df=_classify_when_scraped)
+
+        cls_results = await asyncio.gather(*classify_tasks)
+        if cls_results:
+            # copy=False: the per-source result frames are discarded right
+            # after, so concat can reuse their blocks instead of copying.
+            df = pd.concat(cls_results, ignore_index=True, copy=False)
+        else:
+            df = pd.DataFrame(columns=["id", "platform", "score", "tags"])
+
+        # Stitch classification results back onto the scraped rows. The
+        # results are keyed uniquely by (id, platform), so a single reindex
+        # probe replaces merge's two-sided hash build.
+        df_cls = df.drop_duplicates(subset=["id", "platform"]).set_index(["id", "platform"])
+        keys = pd.MultiIndex.from_arrays([df_combined["id"], df_combined["platform"]])
+        df_merged = df_combined
+        for col in df_cls.columns:
+            df_merged[col] = df_cls[col].reindex(keys).to_numpy()
 
         records = df_merged.to_dict(orient="records")
         # records = df_combined.to_dict(orient="records")
-        json_output = json.dumps(
-            records,
-            indent=2,
-            ensure_ascii=False,
-            default=str
-        )
         today = datetime.now().strftime("%Y-%m-%d")
         os.makedirs("out", exist_ok=True)
         output_path = f"out/{today}-crypto_tg_news.json"
 
-        with open(output_path, "w", encoding="utf-8") as f:
-            f.write(json_output)
+        # Stream the array one record at a time — the full JSON document
+        # never exists in memory alongside the records themselves.
+        opts = orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY
+        with open(output_path, "wb") as f:
+            f.write(b"[\n")
+            for i, record in enumerate(records):
+                if i:
+                    f.write(b",\n")
+                f.write(orjson.dumps(record, option=opts, default=str))
+            f.write(b"\n]\n")
 
         # Log Summery
-        total_pulled = sum(log["pulled"] for log in run_stats)
-        total_kept = sum(log["kept"] for log in run_stats)
+        total_pulled = total_kept = 0
+        for log in run_stats:
+            total_pulled += log["pulled"]
+            total_kept += log["kept"]
         logger.info(f"📊 [TOTAL]  Pulled: {total_pulled} | Kept: {total_kept}")
 
     finally:
+        await classification_class.close()
         await tg_scraper.close()
         await close_notification_session()
 
@@ -1,6 +1,8 @@
 import os
 import asyncio
-import json
+import re
+
+import orjson
 import pandas as pd
 from openai import AsyncOpenAI
 from dotenv import load_dotenv
@@ -10,16 +12,28 @@ from src.notification import send_error_to_telegram, send_notify_telegram
 
 load_dotenv()
 
+# Cheap keyword screen used to skip rows that can never earn a tag —
+# every eliminated row saves one LLM round trip (and its tokens).
+_CRYPTO_RE = re.compile(
+    r"\b(?:btc|eth|sol|nft|dao|zk|airdrop|listing|token|stak|bridge|"
+    r"exploit|rug|phish|audit|governance|vote)\w*",
+    re.IGNORECASE,
+)
+
 
 class LLMClassifier:
     """
     A classifier that uses DeepSeek LLM to categorize Web3/crypto messages.
     """
 
-    def __init__(self):
+    def __init__(self, max_concurrent_requests: int = 5):
         """
         Initialize the classifier with API credentials from .env.
         Only DeepSeek is supported.
+
+        Args:
+            max_concurrent_requests: Global cap on in-flight API requests,
+                shared across all concurrent classify() calls.
         """
         self.api_key = os.getenv("DEEPSEEK_API_KEY")
         if not self.api_key:
@@ -35,7 +49,15 @@ class LLMClassifier:
         # ]
         # {', '.join(self.allowed_tags)}
 
-        self.client = AsyncOpenAI(api_key=self.api_key, base_url=self.base_url)
+        # Shared across all batches so every request reuses one httpx connection
+        # pool instead of paying a TCP/TLS handshake per batch.
+        # max_retries=0 because _classify_batch does its own retry loop.
+        self.client = AsyncOpenAI(api_key=self.api_key, base_url=self.base_url, max_retries=0)
+        # Instance-level request cap: classify()'s max_concurrent only
+        # bounds workers within one call, and main spawns one classify()
+        # task per scraped source — without this shared semaphore the
+        # aggregate in-flight requests would scale with the source count.
+        self._request_semaphore = asyncio.Semaphore(max_concurrent_requests)
         self.system_prompt = self.build_system_prompt()
 
     def build_system_prompt(self) -> str:
@@ -79,27 +101,37 @@ EXAMPLE JSON OUTPUT:
 ]
 """.strip()
 
+    async def close(self):
+        """Close the shared OpenAI client and its underlying connection pool."""
+        await self.client.close()
+
     async def _classify_batch(self, batch: list[dict]) -> list[dict]:
         """Classify a single batch of messages using DeepSeek API."""
-        user_prompt = json.dumps(batch, ensure_ascii=False)
+        user_prompt = orjson.dumps(batch, option=orjson.OPT_SERIALIZE_NUMPY).decode()
 
         for attempt in range(3):
             try:
-                response = await self.client.chat.completions.create(
-                    model=self.model,
-                    messages=[
-                        {"role": "system", "content": self.system_prompt},
-                        {"role": "user", "content": user_prompt}
-                    ],
-                    timeout=60
-                )
+                async with self._request_semaphore:
+                    response = await self.client.chat.completions.create(
+                        model=self.model,
+                        messages=[
+                            {"role": "system", "content": self.system_prompt},
+                            {"role": "user", "content": user_prompt}
+                        ],
+                        timeout=60
+                    )
 
                 content = response.choices[0].message.content.strip()
-                result = json.loads(content)
+                result = orjson.loads(content)
                 if isinstance(result, list) and len(result) == len(batch):
                     return result
+                self.logger.warning(
+                    f"⚠️ Retry {attempt + 1}/3: expected {len(batch)} items, got "
+                    f"{len(result) if isinstance(result, list) else type(result).__name__}"
+                )
             except Exception as e:
                 self.logger.warning(f"⚠️ Retry {attempt + 1}/3: {e}")
+            if attempt < 2:  # no backoff after the final attempt
                 await asyncio.sleep(2 ** attempt)
 
         # Fallback after all retries exhausted
@@ -123,39 +155,75 @@ EXAMPLE JSON OUTPUT:
         if missing_cols:
             raise ValueError(f"Missing required columns: {missing_cols}")
 
-        # Make a copy and fill optional columns
-        df_clean = df.copy()
-
-        if "links" not in df_clean.columns:
-            df_clean["links"] = [[] for _ in range(len(df_clean))]
+        # Materialize the filtered working frame once — no deep copy of the
+        # caller's frame followed by another filter-and-copy.
+        if "links" in df.columns:
+            links_col = df["links"].map(lambda x: x if isinstance(x, list) else [])
         else:
-            df_clean["links"] = df_clean["links"].apply(
-                lambda x: x if isinstance(x, list) else []
-            )
+            links_col = pd.Series([[] for _ in range(len(df))], index=df.index)
 
-        df_clean = df_clean.dropna(subset=["text"]).copy()
-        df_clean["text"] = df_clean["text"].astype(str)
+        df_clean = df.loc[df["text"].notna(), ["id", "platform", "text"]].assign(
+            text=lambda d: d["text"].astype(str),
+            links=links_col,
+        )
 
         if df_clean.empty:
             self.logger.info("No valid messages to classify.")
             await send_error_to_telegram("❌ No valid messages to classify.")
             return pd.DataFrame(columns=["id", "platform", "keep", "score", "tags"])
 
-        input_data = df_clean[["id", "text", "platform", "links"]].to_dict(orient="records")
+        # Pre-filter: rows with no crypto keyword, no links and only short
+        # text cannot score >= 0.70, so don't spend an LLM call on them.
+        # Skipped rows need no fallback records — classify() only returns
+        # kept rows anyway.
+        sendable = (
+            df_clean["text"].str.contains(_CRYPTO_RE, na=False)
+            | df_clean["links"].str.len().gt(0)
+            | df_clean["text"].str.len().gt(200)
+        )
+        n_skipped = int((~sendable).sum())
+        if n_skipped:
+            self.logger.info(f"⏭️ Pre-filtered {n_skipped} rows with no classifiable signal.")
+            df_clean = df_clean[sendable]
+
+        if df_clean.empty:
+            self.logger.info("No rows left to classify after pre-filtering.")
+            return pd.DataFrame(columns=["id", "platform", "keep", "score", "tags"])
 
-        # Batch processing
-        batches = [input_data[i:i + batch_size] for i in range(0, len(input_data), batch_size)]
-        semaphore = asyncio.Semaphore(max_concurrent)
+        # Stream batches straight from the column arrays — no intermediate
+        # full list of per-row dicts; row dicts only exist inside a batch.
+        ids = df_clean["id"].to_numpy()
+        texts = df_clean["text"].to_numpy()
+        platforms = df_clean["platform"].to_numpy()
+        links = df_clean["links"].to_numpy()
+        n_rows = len(df_clean)
+
+        # Bounded producer-consumer: a fixed pool of workers drains a small
+        # queue, so only ~max_concurrent*2 batches are materialized at once
+        # instead of every batch (and its task) living upfront.
+        queue: asyncio.Queue = asyncio.Queue(maxsize=max_concurrent * 2)
         results = []
 
-        async def _process_batch(batch):
-            async with semaphore:
+        async def _producer():
+            for i in range(0, n_rows, batch_size):
+                batch = [
+                    {"id": ids[j], "text": texts[j], "platform": platforms[j], "links": links[j]}
+                    for j in range(i, min(i + batch_size, n_rows))
+                ]
+                await queue.put(batch)
+            for _ in range(max_concurrent):
+                await queue.put(None)  # one stop signal per worker
+
+        async def _worker():
+            while True:
+                batch = await queue.get()
+                if batch is None:
+                    break
                 result = await self._classify_batch(batch)
                 results.extend(result)
                 self.logger.info(f"✅ Batch completed: {len(result)} items classified")
 
-        tasks = [_process_batch(batch) for batch in batches]
-        await asyncio.gather(*tasks)
+        await asyncio.gather(_producer(), *(_worker() for _ in range(max_concurrent)))
 
         result_df = pd.DataFrame(results)
         result_df = result_df[result_df["keep"] == "true"]
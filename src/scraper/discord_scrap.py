@@ -1,6 +1,7 @@
 import os
 import asyncio
 import aiohttp
+import orjson
 import pandas as pd
 from datetime import datetime, timezone, timedelta
 from dotenv import load_dotenv
@@ -8,10 +9,26 @@ from dotenv import load_dotenv
 from src.logger import get_logger
 from src.types import ScrapeStats
 from src.notification import send_error_to_telegram
-from src.normalization import filter_text, is_low_value_message
+from src.normalization import filter_text, low_value_mask
 
 load_dotenv()
 
+_COLUMNS = ["id", "text", "timestamp", "author", "channel_id", "platform", "links"]
+
+
+def _extract_embed_links(embeds) -> list[str]:
+    """Collect non-empty embed URLs from a raw Discord embeds payload."""
+    if not isinstance(embeds, list):
+        return []
+    links = []
+    for embed in embeds:
+        url = embed.get("url")
+        if url and isinstance(url, str):
+            url_clean = url.strip()
+            if url_clean:
+                links.append(url_clean)
+    return links
+
 
 class DiscordScraper:
     def __init__(self):
@@ -23,6 +40,21 @@ class DiscordScraper:
         if not self.auth_token:
             raise ValueError("DISCORD_TOKEN not found in .env")
         self.logger = get_logger(self.__class__.__name__)
+        # Shared session — lazily created, reused across all channel fetches
+        self._session: aiohttp.ClientSession | None = None
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=50, ttl_dns_cache=600, keepalive_timeout=60)
+            )
+        return self._session
+
+    async def close(self):
+        """Close the shared HTTP session if active."""
+        if self._session and not self._session.closed:
+            await self._session.close()
+            self._session = None
 
     async def fetch_and_filter_messages(self, channel_id: str, max_retries: int = 3) -> tuple[pd.DataFrame, ScrapeStats]:
         """
@@ -42,113 +74,116 @@ class DiscordScraper:
         }
 
         cutoff_time = datetime.now(timezone.utc) - timedelta(hours=24)
+        # Discord timestamps are ISO-8601 with a fixed +00:00 offset, so they
+        # sort lexicographically — the cutoff check can compare strings and
+        # skip a datetime parse per message.
+        cutoff_iso = cutoff_time.isoformat()
         all_messages = []
         before_id = None
         retry_count = 0
 
-        async with aiohttp.ClientSession() as session:
-            while True:
-                params = {"limit": 100}
-                if before_id:
-                    params["before"] = before_id
-
-                try:
-                    async with session.get(
-                            url, headers=headers, params=params, timeout=aiohttp.ClientTimeout(total=30)
-                    ) as resp:
-                        retry_count = 0  # reset on success
-
-                        if resp.status == 200:
-                            batch = await resp.json()
-                        elif resp.status == 429:
-                            retry_after = int(resp.headers.get("Retry-After", 1))
-                            self.logger.warning(f"⚠️ Rate limited. Waiting {retry_after} seconds...")
-                            await asyncio.sleep(retry_after)
-                            continue
-                        elif resp.status == 401:
-                            await send_error_to_telegram("❌ Invalid token or missing 'Read Message History' permission.")
-                            raise PermissionError("❌ Invalid token or missing 'Read Message History' permission.")
-                        elif resp.status == 403:
-                            await send_error_to_telegram("❌ Bot lacks access to this channel.")
-                            raise PermissionError("❌ Bot lacks access to this channel.")
-                        elif resp.status == 404:
-                            await send_error_to_telegram("❌ Channel ID not found.")
-                            raise ValueError("❌ Channel ID not found.")
-                        else:
-                            error_text = await resp.text()
-                            await send_error_to_telegram(f"⚠️ HTTP {resp.status}: {error_text[:200]}")
-                            self.logger.error(f"⚠️ HTTP {resp.status}: {error_text[:200]}")
-                            break
-
-                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
-                    retry_count += 1
-                    self.logger.warning(f"🔄 Network error (attempt {retry_count}/{max_retries}): {e}")
-                    if retry_count >= max_retries:
-                        await send_error_to_telegram("❌ Max retries reached. Stopping fetch.")
-                        self.logger.error("❌ Max retries reached. Stopping fetch.")
-                        break
-                    await asyncio.sleep(2 ** retry_count)  # exponential backoff
-                    continue
-
-                if not batch:
-                    break
-
-                valid_messages = []
-                for msg in batch:
-                    try:
-                        ts_str = msg["timestamp"].rstrip("Z")
-                        msg_time = datetime.fromisoformat(ts_str).replace(tzinfo=timezone.utc)
-                    except (ValueError, KeyError, TypeError):
+        session = await self._get_session()
+
+        while True:
+            params = {"limit": 100}
+            if before_id:
+                params["before"] = before_id
+
+            try:
+                async with session.get(
+                        url, headers=headers, params=params, timeout=aiohttp.ClientTimeout(total=30)
+                ) as resp:
+                    retry_count = 0  # reset on success
+
+                    if resp.status == 200:
+                        batch = orjson.loads(await resp.read())
+                    elif resp.status == 429:
+                        retry_after = int(resp.headers.get("Retry-After", 1))
+                        self.logger.warning(f"⚠️ Rate limited. Waiting {retry_after} seconds...")
+                        await asyncio.sleep(retry_after)
                         continue
-
-                    if msg_time >= cutoff_time:
-                        valid_messages.append(msg)
+                    elif resp.status == 401:
+                        await send_error_to_telegram("❌ Invalid token or missing 'Read Message History' permission.")
+                        raise PermissionError("❌ Invalid token or missing 'Read Message History' permission.")
+                    elif resp.status == 403:
+                        await send_error_to_telegram("❌ Bot lacks access to this channel.")
+                        raise PermissionError("❌ Bot lacks access to this channel.")
+                    elif resp.status == 404:
+                        await send_error_to_telegram("❌ Channel ID not found.")
+                        raise ValueError("❌ Channel ID not found.")
                     else:
-                        break  # messages are in descending order
+                        error_text = await resp.text()
+                        await send_error_to_telegram(f"⚠️ HTTP {resp.status}: {error_text[:200]}")
+                        self.logger.error(f"⚠️ HTTP {resp.status}: {error_text[:200]}")
+                        break
 
-                if not valid_messages:
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                retry_count += 1
+                self.logger.warning(f"🔄 Network error (attempt {retry_count}/{max_retries}): {e}")
+                if retry_count >= max_retries:
+                    await send_error_to_telegram("❌ Max retries reached. Stopping fetch.")
+                    self.logger.error("❌ Max retries reached. Stopping fetch.")
                     break
+                await asyncio.sleep(2 ** retry_count)  # exponential backoff
+                continue
+
+            if not batch:
+                break
 
-                all_messages.extend(valid_messages)
+            valid_messages = []
+            for msg in batch:
+                ts_str = msg.get("timestamp")
+                if not isinstance(ts_str, str):
+                    continue
 
-                if len(batch) == 100 and len(valid_messages) == 100:
-                    before_id = valid_messages[-1]["id"]
+                if ts_str >= cutoff_iso:
+                    valid_messages.append(msg)
                 else:
-                    break
+                    break  # messages are in descending order
 
-        filtered_data = []
+            if not valid_messages:
+                break
 
-        for msg in all_messages:
-            raw_content = msg.get("content", "") or ""
+            all_messages.extend(valid_messages)
 
-            if is_low_value_message(raw_content):
-                continue
+            if len(batch) == 100 and len(valid_messages) == 100:
+                before_id = valid_messages[-1]["id"]
+            else:
+                break
 
-            text_clean = filter_text(raw_content)
-
-            # Extract URLs from embeds
-            links = []
-            for embed in msg.get("embeds", []):
-                url = embed.get("url")
-                if url and isinstance(url, str):
-                    url_clean = url.strip()
-                    if url_clean:
-                        links.append(url_clean)
-
-            filtered_data.append({
-                "id": msg["id"],
-                "text": text_clean,
-                "timestamp": msg["timestamp"],
-                "author": f"{msg['author']['username']}#{msg['author']['id']}",
+        total_pulled = len(all_messages)
+
+        if all_messages:
+            # Column-wise filtering instead of a per-message Python loop
+            df_raw = pd.DataFrame(all_messages)
+            text = df_raw["content"].fillna("").astype(str)
+            low_value = low_value_mask(text)
+
+            kept = df_raw[~low_value]
+            links = (kept["embeds"].map(_extract_embed_links).to_numpy()
+                     if "embeds" in kept.columns else [[] for _ in range(len(kept))])
+            # Hand pandas ready-made columns (plain arrays, no index to
+            # align, copy=False) instead of per-row dicts.
+            df = pd.DataFrame({
+                "id": kept["id"].to_numpy(),
+                "text": text[~low_value].map(filter_text).to_numpy(),
+                "timestamp": kept["timestamp"].to_numpy(),
+                "author": kept["author"].map(lambda a: f"{a['username']}#{a['id']}").to_numpy(),
                 "channel_id": channel_id,
                 "platform": "discord",
-                "links": links
-            })
+                "links": links,
+            }, copy=False)
+        else:
+            df = pd.DataFrame(columns=_COLUMNS)
 
-        total_pulled = len(all_messages)
-        total_kept = len(filtered_data)
+        # Fixed-format C parser; cache=True collapses repeated stamps.
+        df["timestamp"] = pd.to_datetime(df["timestamp"], format="ISO8601", utc=True, cache=True)
+
+        # Fetch order is newest-first, so keep="first" retains the latest
+        # message per text; dedup before sorting so the sort runs on the
+        # smaller frame.
+        df = df.drop_duplicates(subset=["text"], keep="first").sort_values("timestamp")
+        total_kept = len(df)
 
         self.logger.info(f"📊 [Discord] Pulled: {total_pulled} | Kept: {total_kept}")
-        df = pd.DataFrame(filtered_data)
-        df.sort_values("timestamp").drop_duplicates(subset=["text"], keep="last")
         return df, ScrapeStats(channel_id=channel_id, platform="discord", pulled=total_pulled, kept=total_kept)
@@ -146,6 +146,9 @@ class TelegramScraper:
                 df = pd.DataFrame(columns=["id", "text", "timestamp", "author", "channel_id","platform", "links"])
             else:
                 df = pd.DataFrame(records)
+                # Telethon already yields tz-aware datetimes; this just sets
+                # the column to a proper datetime64[ns, UTC] dtype.
+                df["timestamp"] = pd.to_datetime(df["timestamp"], utc=True)
                 df = df.sort_values("timestamp").drop_duplicates(subset=["text"], keep="last")
 
             total_kept = len(df)
@@ -1,7 +1,10 @@
 import asyncio
+import random
+from collections import deque
 
+import aiohttp
 import pandas as pd
-from typing import List, Union
+from typing import Callable, List, Optional, Union
 
 from src.logger import get_logger
 from src.scraper.discord_scrap import DiscordScraper
@@ -12,12 +15,79 @@ from src.types import ScrapeStats
 
 logger = get_logger(__name__)
 
+_COMBINED_COLUMNS = ["id", "text", "timestamp", "author", "channel_id", "platform", "links"]
+
+# Arrow-backed strings keep text in one contiguous UTF-8 buffer (roughly
+# half the memory of object arrays, faster hashing); fall back to the
+# default string dtype when pyarrow isn't installed.
+try:
+    import pyarrow  # noqa: F401
+    _TEXT_DTYPE = "string[pyarrow]"
+except ImportError:
+    _TEXT_DTYPE = "string"
+
+# Explicit dtypes for the combined frame so nothing is left to object-dtype
+# inference: category for the low-cardinality key columns, pandas string
+# dtype for text. id/author stay object on purpose — they legitimately mix
+# ints, strings and None per platform.
+_COMBINED_SCHEMA = {"text": _TEXT_DTYPE, "platform": "category", "channel_id": "category"}
+
+
+def _near_dedup_mask(texts, threshold: float = 0.85, num_perm: int = 128, ngram: int = 3) -> list[bool]:
+    """
+    Greedy MinHash-LSH near-duplicate mask over an ordered text list.
+
+    Texts are expected newest-first; the first member of each
+    near-duplicate cluster is kept (True) and later members dropped, so
+    cross-posted stories that differ only in punctuation/emoji/trailing
+    credits collapse without O(n^2) comparisons.
+    """
+    try:
+        from datasketch import MinHash, MinHashLSH
+    except ImportError as e:
+        raise ImportError("dedup='minhash' requires the optional datasketch package") from e
+
+    lsh = MinHashLSH(threshold=threshold, num_perm=num_perm)
+    keep = []
+    for i, text in enumerate(texts):
+        m = MinHash(num_perm=num_perm)
+        for j in range(max(len(text) - ngram + 1, 1)):
+            m.update(text[j:j + ngram].encode("utf-8"))
+        if lsh.query(m):
+            keep.append(False)
+        else:
+            lsh.insert(i, m)
+            keep.append(True)
+    return keep
+
+
+async def retry_async(factory, max_attempts: int = 5, base: float = 0.5, cap: float = 30.0):
+    """
+    Await factory() with jittered exponential backoff on transient network errors.
+
+    Only aiohttp/timeout failures are retried — auth errors, bad channel
+    ids etc. propagate immediately. Rate-limit (429) waits are handled
+    inside the scrapers from the Retry-After header.
+    """
+    for attempt in range(max_attempts):
+        try:
+            return await factory()
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            if attempt == max_attempts - 1:
+                raise
+            delay = min(cap, base * 2 ** attempt) + random.random() * 0.1
+            logger.warning(f"🔄 Transient error ({e}), retry {attempt + 1}/{max_attempts} in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
 
 async def scrape_all_sources(
         telethon_client,  # Already-connected TelegramClient from TelegramScraper
         discord_channels: List[str],
         telegram_groups: List[Union[str, int]],
-        max_concurrent: int = 10
+        max_concurrent: int = 10,
+        on_source_df: Optional[Callable[[pd.DataFrame], None]] = None,
+        top_k: Optional[int] = None,
+        dedup: str = "exact"
 ) -> tuple[pd.DataFrame, list[ScrapeStats]]:
     """
     Scrape messages from Discord and Telegram concurrently.
@@ -26,82 +96,162 @@ async def scrape_all_sources(
         discord_channels: List of Discord channel IDs (as strings).
         telegram_groups: List of Telegram group usernames or invite links.
         telethon_client: An already-connected and authorized TelegramClient.
-        max_concurrent: Maximum number of concurrent scraping tasks.
+        max_concurrent: Number of scrape workers draining the job queue.
+        on_source_df: Optional callback invoked with each non-empty
+            per-source DataFrame as soon as that source finishes, so
+            downstream work (e.g. classification) can start before the
+            slowest source completes.
+        top_k: If set, return only the newest top_k messages. With a
+            single contributing source this uses a heap pick (O(n log k))
+            instead of the full sort.
+        dedup: "exact" (default) drops byte-identical texts only;
+            "minhash" additionally prunes near-duplicates via MinHash-LSH
+            (requires the optional datasketch package).
 
     Returns:
         pd.DataFrame: Combined and deduplicated messages.
     """
-    semaphore = asyncio.Semaphore(max_concurrent)
-    all_dfs = []
-    all_stats: list[ScrapeStats] = []
+    if dedup not in ("exact", "minhash"):
+        raise ValueError(f"Unknown dedup mode: {dedup!r} (expected 'exact' or 'minhash')")
+
+    # deques: O(1) appends from many interleaved coroutines with no
+    # list-resize copies; drained once at the end.
+    all_records: deque[dict] = deque()
+    all_stats: deque[ScrapeStats] = deque()
+    errors: deque[str] = deque()
+    sources_with_data = 0
 
-    # Initialize scrapers
+    # Initialize scrapers — one shared instance each; the Telegram scraper
+    # just wraps the already-connected client the caller provides
     discord_scraper = DiscordScraper()
+    telegram_scraper = TelegramScraper()
+    telegram_scraper.client = telethon_client
 
     async def _scrape_discord(channel_id: str):
-        async with semaphore:
-            try:
-                df_discord, stats = await discord_scraper.fetch_and_filter_messages(channel_id, max_retries=3)
-
-                all_stats.append(stats)
-
-                if not df_discord.empty:
-                    all_dfs.append(df_discord)
-            except Exception as e:
-                await send_error_to_telegram(f"❌ Discord {channel_id} error: {str(e)}")
-                logger.error(f"❌ Discord {channel_id} error: {str(e)}")
-                all_stats.append(ScrapeStats(channel_id=channel_id,
-                                             platform="discord",
-                                             pulled=0,
-                                             kept=0,
-                                             success=False,
-                                             error=str(e)))
+        try:
+            df_discord, stats = await retry_async(
+                lambda: discord_scraper.fetch_and_filter_messages(channel_id, max_retries=3)
+            )
+
+            all_stats.append(stats)
+
+            if not df_discord.empty:
+                nonlocal sources_with_data
+                sources_with_data += 1
+                all_records.extend(df_discord.to_dict("records"))
+                if on_source_df is not None:
+                    on_source_df(df_discord)
+        except Exception as e:
+            errors.append(f"❌ Discord {channel_id} error: {str(e)}")
+            logger.error(f"❌ Discord {channel_id} error: {str(e)}")
+            all_stats.append(ScrapeStats(channel_id=channel_id,
+                                         platform="discord",
+                                         pulled=0,
+                                         kept=0,
+                                         success=False,
+                                         error=str(e)))
 
     async def _scrape_telegram(group_id: Union[str, int]):
-        async with semaphore:
-            try:
-                # Reuse the provided connected client
-                scraper = TelegramScraper()
-                scraper.client = telethon_client
-
-                df_telegram, stats = await scraper.scrape_24h_to_df_telegram(group_id)
-
-                all_stats.append(stats)
-
-                if not df_telegram.empty:
-                    all_dfs.append(df_telegram)
-            except Exception as e:
-                await send_error_to_telegram(f"❌ Telegram {group_id} error: {str(e)}")
-                logger.error(f"❌ Telegram {group_id} error: {str(e)}")
-                all_stats.append(ScrapeStats(channel_id=group_id,
-                                             platform="telegram",
-                                             pulled=0,
-                                             kept=0,
-                                             success=False,
-                                             error=str(e)))
-
-    # Build tasks
-    tasks = []
-    tasks.extend(_scrape_discord(cid) for cid in discord_channels)
-    tasks.extend(_scrape_telegram(gid) for gid in telegram_groups)
-
-    # Run concurrently
-    await asyncio.gather(*tasks)
+        try:
+            df_telegram, stats = await retry_async(
+                lambda: telegram_scraper.scrape_24h_to_df_telegram(group_id)
+            )
+
+            all_stats.append(stats)
+
+            if not df_telegram.empty:
+                nonlocal sources_with_data
+                sources_with_data += 1
+                all_records.extend(df_telegram.to_dict("records"))
+                if on_source_df is not None:
+                    on_source_df(df_telegram)
+        except Exception as e:
+            errors.append(f"❌ Telegram {group_id} error: {str(e)}")
+            logger.error(f"❌ Telegram {group_id} error: {str(e)}")
+            all_stats.append(ScrapeStats(channel_id=group_id,
+                                         platform="telegram",
+                                         pulled=0,
+                                         kept=0,
+                                         success=False,
+                                         error=str(e)))
+
+    # Fixed worker pool draining a job queue (same pattern as the
+    # classifier): max_concurrent tasks total instead of one task per
+    # source all contending on a shared semaphore. Results land in
+    # all_records as each source finishes and the per-source frame is
+    # dropped right away.
+    job_queue: asyncio.Queue = asyncio.Queue()
+    for cid in discord_channels:
+        job_queue.put_nowait(("discord", cid))
+    for gid in telegram_groups:
+        job_queue.put_nowait(("telegram", gid))
+    for _ in range(max_concurrent):
+        job_queue.put_nowait(None)  # one stop signal per worker
+
+    async def _worker():
+        while True:
+            job = await job_queue.get()
+            if job is None:
+                break
+            kind, arg = job
+            if kind == "discord":
+                await _scrape_discord(arg)
+            else:
+                await _scrape_telegram(arg)
+
+    try:
+        async with asyncio.TaskGroup() as tg:
+            for _ in range(max_concurrent):
+                tg.create_task(_worker())
+    finally:
+        await discord_scraper.close()
+
+    # One consolidated notification instead of a round trip per failure
+    if errors:
+        summary = "\n".join(list(errors)[:20])
+        if len(errors) > 20:
+            summary += f"\n… and {len(errors) - 20} more"
+        await send_error_to_telegram(f"⚠️ {len(errors)} source(s) failed:\n{summary}")
 
     # Combine and deduplicate
-    if all_dfs:
-        combined = pd.concat(all_dfs, ignore_index=True)
+    if all_records:
+        # One flat record list -> one DataFrame: a single allocation with no
+        # per-frame block consolidation the multi-frame concat paid for.
+        combined = pd.DataFrame.from_records(list(all_records), columns=_COMBINED_COLUMNS)
+        combined = combined.astype(_COMBINED_SCHEMA, copy=False)
+        # Both scrapers emit tz-aware Timestamps now, so this is a cheap
+        # dtype cast rather than a per-string dateutil parse.
         combined['timestamp'] = pd.to_datetime(combined['timestamp'], errors='coerce', utc=True)
-        combined = (
-            combined
-            .sort_values("timestamp")
-            .drop_duplicates(subset=["text"], keep="last")
-            .sort_values("timestamp", ascending=False)
-            .reset_index(drop=True)
-        )
+        if top_k is not None and sources_with_data <= 1 and dedup == "exact":
+            # Single source means the frame is already text-deduped, so a
+            # heap pick of the newest K rows replaces the full sort.
+            combined = combined.nlargest(top_k, "timestamp").reset_index(drop=True)
+        else:
+            # One descending sort, then keep="first" retains the latest
+            # message per text — same rows the old sort/dedup/re-sort chain
+            # produced, minus one O(n log n) sort and a full-frame copy.
+            combined.sort_values("timestamp", ascending=False, inplace=True)
+            # Dedup on an int64 hash of the text: the duplicated() kernel
+            # then runs on the integer hashtable path instead of hashing
+            # Python strings row by row. Each scraper already dedups its own
+            # frame by text, so with a single contributing source there is
+            # nothing left for the cross-source pass to remove.
+            if sources_with_data > 1:
+                combined["_text_hash"] = pd.util.hash_pandas_object(combined["text"], index=False).astype("int64")
+                combined.drop_duplicates(subset=["_text_hash"], keep="first", inplace=True, ignore_index=True)
+                combined.drop(columns="_text_hash", inplace=True)
+            else:
+                combined.reset_index(drop=True, inplace=True)
+            if dedup == "minhash":
+                # Rows are newest-first, so keep-first retains the newest
+                # member of each near-duplicate cluster.
+                combined = combined[_near_dedup_mask(combined["text"].tolist())]
+                combined.reset_index(drop=True, inplace=True)
+            if top_k is not None:
+                combined = combined.head(top_k)
         logger.info(f"✅ Total combined messages: {len(combined)}")
-        return combined, all_stats
+        return combined, list(all_stats)
     else:
         await send_error_to_telegram("⚠️ No messages collected from any source.")
         logger.warning("⚠️ No messages collected from any source.")
-        return pd.DataFrame(columns=["id", "text", "timestamp", "author", "channel_id", "links"]), all_stats
+        return pd.DataFrame(columns=_COMBINED_COLUMNS).astype(_COMBINED_SCHEMA), list(all_stats)